@@ -25,44 +25,49 @@ CREATE DATABASE IF NOT EXISTS `parkonic_tickets`
 
 USE `parkonic_tickets`;
 
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+
 --
 -- Table structure for table `omc_ticket`
 --
 
 DROP TABLE IF EXISTS `omc_ticket`;
 
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `omc_ticket` (
   `id` int unsigned NOT NULL AUTO_INCREMENT,
-  `camera_id` int DEFAULT NULL,
+  `camera_id` smallint DEFAULT NULL,
   `zone_name` varchar(50) DEFAULT NULL,
-  `camera_ip` varchar(45) DEFAULT NULL,
+  `camera_ip` varchar(45) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `zone_region` varchar(50) DEFAULT NULL,
-  `spot_number` int DEFAULT NULL,
+  `spot_number` smallint DEFAULT NULL,
   `plate_number` varchar(20) DEFAULT NULL,
-  `plate_code` varchar(10) DEFAULT NULL,
+  `plate_code` varchar(10) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `plate_city` varchar(50) DEFAULT NULL,
-  `confidence` int DEFAULT NULL,
+  `confidence` smallint DEFAULT NULL,
   `entry_time` datetime DEFAULT NULL,
   `exit_time` datetime DEFAULT NULL,
   `status` varchar(20) DEFAULT NULL,
   `parkonic_trip_id` int DEFAULT NULL,
-  `image_base64` longtext,
+  `image_base64` mediumtext CHARACTER SET ascii COLLATE ascii_bin,
   `crop_image_path` varchar(255) DEFAULT NULL,
   `entry_image_path` varchar(255) DEFAULT NULL,
   `exit_image_path` varchar(255) DEFAULT NULL,
   `exit_clip_path` varchar(255) DEFAULT NULL,
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` datetime(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   `process_time_in` datetime DEFAULT NULL,
   `process_time_out` datetime DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `idx_camera_time` (`camera_id`,`entry_time`),
+  KEY `idx_created_at` (`created_at`),
   KEY `idx_plate` (`plate_number`,`plate_code`),
+  KEY `idx_status_exit` (`status`,`exit_time`),
   KEY `idx_trip` (`parkonic_trip_id`),
-  KEY `idx_zone` (`zone_name`,`zone_region`)
+  KEY `idx_updated_at` (`updated_at`),
+  KEY `idx_zone` (`zone_name`,`zone_region`),
+  CONSTRAINT `ck_omc_ticket_confidence` CHECK (`confidence` between 0 and 100)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
 
 --
 -- Table structure for table `ocr_ticket`
@@ -70,37 +75,41 @@ CREATE TABLE `omc_ticket` (
 
 DROP TABLE IF EXISTS `ocr_ticket`;
 
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `ocr_ticket` (
   `id` int unsigned NOT NULL AUTO_INCREMENT,
-  `camera_id` int DEFAULT NULL,
+  `camera_id` smallint DEFAULT NULL,
   `zone_name` varchar(50) DEFAULT NULL,
-  `camera_ip` varchar(45) DEFAULT NULL,
+  `camera_ip` varchar(45) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `zone_region` varchar(50) DEFAULT NULL,
-  `spot_number` int DEFAULT NULL,
+  `spot_number` smallint DEFAULT NULL,
   `plate_number` varchar(20) DEFAULT NULL,
-  `plate_code` varchar(10) DEFAULT NULL,
+  `plate_code` varchar(10) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `plate_city` varchar(50) DEFAULT NULL,
-  `confidence` int DEFAULT NULL,
+  `confidence` smallint DEFAULT NULL,
   `entry_time` datetime DEFAULT NULL,
   `exit_time` datetime DEFAULT NULL,
   `status` varchar(20) DEFAULT NULL,
   `parkonic_trip_id` int DEFAULT NULL,
-  `image_base64` longtext,
+  `image_base64` mediumtext CHARACTER SET ascii COLLATE ascii_bin,
   `crop_image_path` varchar(255) DEFAULT NULL,
   `entry_image_path` varchar(255) DEFAULT NULL,
   `exit_image_path` varchar(255) DEFAULT NULL,
   `exit_clip_path` varchar(255) DEFAULT NULL,
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` datetime(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   `process_time_in` datetime DEFAULT NULL,
   `process_time_out` datetime DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `idx_camera_time` (`camera_id`,`entry_time`),
+  KEY `idx_created_at` (`created_at`),
   KEY `idx_plate` (`plate_number`,`plate_code`),
+  KEY `idx_status_exit` (`status`,`exit_time`),
   KEY `idx_trip` (`parkonic_trip_id`),
-  KEY `idx_zone` (`zone_name`,`zone_region`)
+  KEY `idx_updated_at` (`updated_at`),
+  KEY `idx_zone` (`zone_name`,`zone_region`),
+  CONSTRAINT `ck_ocr_ticket_confidence` CHECK (`confidence` between 0 and 100)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 /*!40101 SET character_set_client = @saved_cs_client */;
 
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
@@ -113,4 +122,4 @@ CREATE TABLE `ocr_ticket` (
 /*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
 /*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
 
--- Dump completed on 2025-11-25 08:09:06
+-- Dump completed on 2026-10-14 14:40:03
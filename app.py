@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from flask import (
@@ -14,7 +19,14 @@ from flask import (
     flash,
     abort,
 )
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+import orjson
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declared_attr
 from sqlalchemy.sql import func
 from werkzeug.utils import secure_filename
 
@@ -44,8 +56,132 @@ def _build_database_uri(app_root: str) -> str:
     )
 
 
+INT_FIELDS = ("camera_id", "spot_number", "confidence", "parkonic_trip_id")
+# Inclusive bounds of the SMALLINT / INT columns and the confidence CHECK.
+INT_FIELD_RANGES = {
+    "camera_id": (-32768, 32767),
+    "spot_number": (-32768, 32767),
+    "confidence": (0, 100),
+    "parkonic_trip_id": (-2147483648, 2147483647),
+}
+DATETIME_FIELDS = ("entry_time", "exit_time", "process_time_in", "process_time_out")
+STRING_FIELDS = (
+    "zone_name",
+    "camera_ip",
+    "zone_region",
+    "plate_number",
+    "plate_code",
+    "plate_city",
+    "status",
+    "image_base64",
+    "crop_image_path",
+    "entry_image_path",
+    "exit_image_path",
+    "exit_clip_path",
+)
+
+# Large payload columns that list endpoints never fetch; clients read them from
+# the per-ticket endpoints instead.
+LIST_EXCLUDED_FIELDS = frozenset({"image_base64"})
+
+IMAGE_CATEGORIES = ("entry", "exit", "crop")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 100
+
+
+# Uploaded images are written from a shared pool so the files attached to one
+# request are saved concurrently.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="upload")
+
+
+@lru_cache(maxsize=64)
+def _ensure_dir(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _build_engine_options() -> dict:
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+        "query_cache_size": int(os.environ.get("DB_QUERY_CACHE_SIZE", "1200")),
+    }
+
+
+def _ascii_string(length: int):
+    return sa.String(length).with_variant(
+        mysql.VARCHAR(length, charset="ascii", collation="ascii_general_ci"), "mysql"
+    )
+
+
+def _precise_datetime():
+    return sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+class _db_now(sa.sql.expression.ColumnElement):
+    """The database's own clock, at microsecond precision where available.
+
+    updated_at is only ever set from this clock (server default, ON UPDATE
+    and ORM updates alike), so MAX(updated_at) in the list ETag moves forward
+    on every change regardless of the server's time_zone.
+    """
+
+    inherit_cache = True
+    type = sa.DateTime()
+
+
+@compiles(_db_now)
+def _compile_db_now(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(_db_now, "mysql")
+def _compile_db_now_mysql(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP(6)"
+
+
+@compiles(_db_now, "sqlite")
+def _compile_db_now_sqlite(element, compiler, **kw) -> str:
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+class _row_timestamp(_db_now):
+    """Server default for updated_at that MySQL also refreshes on every
+    UPDATE, so rows changed outside the ORM still move their ETag."""
+
+    inherit_cache = True
+
+
+@compiles(_row_timestamp)
+def _compile_row_timestamp(element, compiler, **kw) -> str:
+    return compiler.process(_db_now(), **kw)
+
+
+@compiles(_row_timestamp, "mysql")
+def _compile_row_timestamp_mysql(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+
+
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 def create_app(test_config: Optional[dict] = None) -> Flask:
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.update(
         SECRET_KEY=os.environ.get("FLASK_SECRET_KEY", "dev-key"),
         SQLALCHEMY_DATABASE_URI=_build_database_uri(app.root_path),
@@ -55,63 +191,82 @@ def create_app(test_config: Optional[dict] = None) -> Flask:
     if test_config:
         app.config.update(test_config)
 
+    uses_mysql = app.config["SQLALCHEMY_DATABASE_URI"].startswith("mysql")
+    # The pool settings only suit MySQL's QueuePool; an overriding URI (e.g.
+    # in-memory SQLite in tests) keeps its dialect's defaults.
+    if uses_mysql:
+        app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", _build_engine_options())
+
+    # Without JINJA_CACHE_DIR, Jinja picks a private per-user directory and
+    # verifies its ownership before loading bytecode from it.
+    jinja_cache_dir = os.environ.get("JINJA_CACHE_DIR")
+    if jinja_cache_dir:
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
+    else:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
     db = SQLAlchemy(app)
 
+    # create_tables() never narrows existing columns: tables created before
+    # the SMALLINT/ascii/MEDIUMTEXT types and the confidence CHECK keep their
+    # old definitions until migrated by hand (see create_database.py for the
+    # target DDL). Request validation enforces the same ranges either way.
     class TicketBase:
         __abstract__ = True
 
+        @declared_attr
+        def __table_args__(cls):
+            # MySQL scopes index names to their table, so these match the keys
+            # in create_database.py; other backends share one namespace.
+            prefix = "" if uses_mysql else f"{cls.__tablename__}_"
+            return (
+                db.Index(f"{prefix}idx_created_at", "created_at"),
+                db.Index(f"{prefix}idx_status_exit", "status", "exit_time"),
+                db.Index(f"{prefix}idx_updated_at", "updated_at"),
+                db.CheckConstraint(
+                    "confidence BETWEEN 0 AND 100",
+                    name=f"ck_{cls.__tablename__}_confidence",
+                ),
+            )
+
         id = db.Column(db.Integer, primary_key=True)
-        camera_id = db.Column(db.Integer)
+        camera_id = db.Column(db.SmallInteger)
         zone_name = db.Column(db.String(50))
-        camera_ip = db.Column(db.String(45))
+        camera_ip = db.Column(_ascii_string(45))
         zone_region = db.Column(db.String(50))
-        spot_number = db.Column(db.Integer)
+        spot_number = db.Column(db.SmallInteger)
         plate_number = db.Column(db.String(20))
-        plate_code = db.Column(db.String(10))
+        plate_code = db.Column(_ascii_string(10))
         plate_city = db.Column(db.String(50))
-        confidence = db.Column(db.Integer)
+        confidence = db.Column(db.SmallInteger)
         entry_time = db.Column(db.DateTime)
         exit_time = db.Column(db.DateTime)
         status = db.Column(db.String(20))
         parkonic_trip_id = db.Column(db.Integer)
-        image_base64 = db.Column(db.Text)
+        image_base64 = db.Column(
+            db.Text().with_variant(
+                mysql.MEDIUMTEXT(charset="ascii", collation="ascii_bin"), "mysql"
+            )
+        )
         crop_image_path = db.Column(db.String(255))
         entry_image_path = db.Column(db.String(255))
         exit_image_path = db.Column(db.String(255))
         exit_clip_path = db.Column(db.String(255))
         created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+        updated_at = db.Column(
+            _precise_datetime(),
+            nullable=False,
+            server_default=_row_timestamp(),
+            onupdate=_db_now(),
+        )
         process_time_in = db.Column(db.DateTime)
         process_time_out = db.Column(db.DateTime)
 
+        _columns: tuple = ()
+
         def as_dict(self) -> dict:
-            return {
-                "id": self.id,
-                "camera_id": self.camera_id,
-                "zone_name": self.zone_name,
-                "camera_ip": self.camera_ip,
-                "zone_region": self.zone_region,
-                "spot_number": self.spot_number,
-                "plate_number": self.plate_number,
-                "plate_code": self.plate_code,
-                "plate_city": self.plate_city,
-                "confidence": self.confidence,
-                "entry_time": self.entry_time.isoformat() if self.entry_time else None,
-                "exit_time": self.exit_time.isoformat() if self.exit_time else None,
-                "status": self.status,
-                "parkonic_trip_id": self.parkonic_trip_id,
-                "image_base64": self.image_base64,
-                "crop_image_path": self.crop_image_path,
-                "entry_image_path": self.entry_image_path,
-                "exit_image_path": self.exit_image_path,
-                "exit_clip_path": self.exit_clip_path,
-                "created_at": self.created_at.isoformat() if self.created_at else None,
-                "process_time_in": self.process_time_in.isoformat()
-                if self.process_time_in
-                else None,
-                "process_time_out": self.process_time_out.isoformat()
-                if self.process_time_out
-                else None,
-            }
+            return {key: getattr(self, key) for key in self._columns}
 
     class OcrTicket(TicketBase, db.Model):
         __tablename__ = "ocr_ticket"
@@ -119,69 +274,131 @@ def create_app(test_config: Optional[dict] = None) -> Flask:
     class OmcTicket(TicketBase, db.Model):
         __tablename__ = "omc_ticket"
 
-    def _get_ticket_model(ticket_type: str):
-        mapping = {
-            "ocr": OcrTicket,
-            "omc": OmcTicket,
-        }
-        model = mapping.get(ticket_type.lower()) if ticket_type else None
-        if model is None:
-            abort(404)
-        return model
+    for ticket_model in (OcrTicket, OmcTicket):
+        ticket_model._columns = tuple(ticket_model.__table__.columns.keys())
 
-    def _ticket_label(ticket_type: str) -> str:
-        return "OCR" if ticket_type.lower() == "ocr" else "OMC"
+    ticket_types = {
+        "ocr": (OcrTicket, "OCR"),
+        "omc": (OmcTicket, "OMC"),
+    }
 
-    def create_tables() -> None:
+    def _resolve_ticket_type(ticket_type: str):
+        resolved = ticket_types.get(ticket_type.lower()) if ticket_type else None
+        if resolved is None:
+            abort(404)
+        return resolved
+
+    def _has_rows(model) -> bool:
+        stmt = sa.select(sa.literal(1)).select_from(model).limit(1)
+        return db.session.execute(stmt).scalar() is not None
+
+    def _apply_upgrade_ddl(statement) -> None:
+        # Another deploy may have applied the same change first; MySQL then
+        # reports a duplicate column (1060) or key name (1061).
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(statement)
+        except sa.exc.OperationalError as exc:
+            if exc.orig.args[0] not in (1060, 1061):
+                raise
+
+    def _upgrade_tables() -> None:
+        # create_all() only creates missing tables; bring tables from earlier
+        # releases up to the columns and indexes the queries rely on. This can
+        # rebuild large tables, so only `flask init-db` runs it.
+        if db.engine.dialect.name != "mysql":
+            return
+        inspector = sa.inspect(db.engine)
+        for model in (OcrTicket, OmcTicket):
+            table = model.__table__
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            if "updated_at" not in columns:
+                column_ddl = sa.schema.CreateColumn(table.c.updated_at).compile(
+                    dialect=db.engine.dialect
+                )
+                _apply_upgrade_ddl(
+                    sa.text(f"ALTER TABLE `{table.name}` ADD COLUMN {column_ddl}")
+                )
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    _apply_upgrade_ddl(sa.schema.CreateIndex(index))
+
+    def create_tables(upgrade: bool = False) -> None:
         db.create_all()
-        if not OcrTicket.query.first():
-            sample_ocr_ticket = OcrTicket(
-                camera_id=101,
-                zone_name="A1",
-                camera_ip="192.168.0.10",
-                zone_region="North",
-                spot_number=12,
-                plate_number="ABC123",
-                plate_code="DXB",
-                plate_city="Dubai",
-                confidence=92,
-                entry_time=datetime.utcnow(),
-                status="open",
-                crop_image_path="/tmp/crop.jpg",
+        if upgrade:
+            _upgrade_tables()
+        if not _has_rows(OcrTicket):
+            db.session.execute(
+                sa.insert(OcrTicket),
+                [
+                    {
+                        "camera_id": 101,
+                        "zone_name": "A1",
+                        "camera_ip": "192.168.0.10",
+                        "zone_region": "North",
+                        "spot_number": 12,
+                        "plate_number": "ABC123",
+                        "plate_code": "DXB",
+                        "plate_city": "Dubai",
+                        "confidence": 92,
+                        "entry_time": datetime.utcnow(),
+                        "status": "open",
+                        "crop_image_path": "/tmp/crop.jpg",
+                    }
+                ],
             )
-            db.session.add(sample_ocr_ticket)
-
-        if not OmcTicket.query.first():
-            sample_omc_ticket = OmcTicket(
-                camera_id=201,
-                zone_name="B2",
-                camera_ip="192.168.0.11",
-                zone_region="South",
-                spot_number=5,
-                plate_number="XYZ789",
-                plate_code="AUH",
-                plate_city="Abu Dhabi",
-                confidence=87,
-                entry_time=datetime.utcnow(),
-                status="pending",
-                entry_image_path="/tmp/entry.jpg",
-                crop_image_path="/tmp/crop.jpg",
+
+        if not _has_rows(OmcTicket):
+            db.session.execute(
+                sa.insert(OmcTicket),
+                [
+                    {
+                        "camera_id": 201,
+                        "zone_name": "B2",
+                        "camera_ip": "192.168.0.11",
+                        "zone_region": "South",
+                        "spot_number": 5,
+                        "plate_number": "XYZ789",
+                        "plate_code": "AUH",
+                        "plate_city": "Abu Dhabi",
+                        "confidence": 87,
+                        "entry_time": datetime.utcnow(),
+                        "status": "pending",
+                        "entry_image_path": "/tmp/entry.jpg",
+                        "crop_image_path": "/tmp/crop.jpg",
+                    }
+                ],
             )
-            db.session.add(sample_omc_ticket)
 
         db.session.commit()
 
-    with app.app_context():
-        create_tables()
+    @app.cli.command("init-db")
+    def init_db_command() -> None:
+        """Create the ticket tables, upgrade existing ones and seed sample rows."""
+        create_tables(upgrade=True)
+        print("[OK] Ticket tables created")
+
+    # Startup only creates missing tables and seeds them; upgrading existing
+    # tables is left to `flask init-db` at deploy time.
+    if os.environ.get("AUTO_INIT_DB", "1") == "1":
+        with app.app_context():
+            create_tables()
+
+    @lru_cache(maxsize=4096)
+    def _static_url(script_root: str, filename: str) -> str:
+        # script_root only keys the cache so a prefixed mount never reuses
+        # URLs built for another prefix.
+        return url_for("static", filename=filename)
 
     @app.context_processor
     def register_template_utils():
         def image_url(path: Optional[str]):
             if not path:
                 return None
-            if path.startswith("http://") or path.startswith("https://"):
+            if path.startswith(("http://", "https://")):
                 return path
-            return url_for("static", filename=path.lstrip("/"))
+            return _static_url(request.script_root, path.lstrip("/"))
 
         return {"image_url": image_url}
 
@@ -189,41 +406,14 @@ def create_app(test_config: Optional[dict] = None) -> Flask:
     def home() -> str:
         return redirect(url_for("list_tickets", ticket_type="ocr"))
 
-    def _extract_ticket_data(payload: dict) -> dict:
-        return {
-            "camera_id": _to_int(payload.get("camera_id")),
-            "zone_name": payload.get("zone_name"),
-            "camera_ip": payload.get("camera_ip"),
-            "zone_region": payload.get("zone_region"),
-            "spot_number": _to_int(payload.get("spot_number")),
-            "plate_number": payload.get("plate_number"),
-            "plate_code": payload.get("plate_code"),
-            "plate_city": payload.get("plate_city"),
-            "confidence": _to_int(payload.get("confidence")),
-            "entry_time": _parse_datetime(payload.get("entry_time")),
-            "exit_time": _parse_datetime(payload.get("exit_time")),
-            "status": payload.get("status"),
-            "parkonic_trip_id": _to_int(payload.get("parkonic_trip_id")),
-            "process_time_in": _parse_datetime(payload.get("process_time_in")),
-            "process_time_out": _parse_datetime(payload.get("process_time_out")),
-            "image_base64": payload.get("image_base64"),
-            "crop_image_path": payload.get("crop_image_path"),
-            "entry_image_path": payload.get("entry_image_path"),
-            "exit_image_path": payload.get("exit_image_path"),
-            "exit_clip_path": payload.get("exit_clip_path"),
-        }
-
-    def _save_uploaded_image(upload, ticket_type: str, category: str) -> Optional[str]:
-        if not upload or not upload.filename:
-            return None
-
-        upload_dir = os.path.join(
-            app.root_path, "static", "uploads", ticket_type.lower(), category
+    def _save_uploaded_image(
+        upload, ticket_type: str, category: str, timestamp: str
+    ) -> str:
+        upload_dir = _ensure_dir(
+            os.path.join(app.root_path, "static", "uploads", ticket_type.lower(), category)
         )
-        os.makedirs(upload_dir, exist_ok=True)
 
         filename = secure_filename(upload.filename) or f"{category}.jpg"
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
         final_name = f"{timestamp}_{filename}"
         save_path = os.path.join(upload_dir, final_name)
         upload.save(save_path)
@@ -231,64 +421,131 @@ def create_app(test_config: Optional[dict] = None) -> Flask:
         return os.path.relpath(save_path, os.path.join(app.root_path, "static"))
 
     def _populate_ticket_from_request(ticket, ticket_type: str):
-        form_data = request.form.to_dict() if request.form else {}
-        json_data = request.get_json(silent=True) or {}
-        data = {**json_data, **form_data}
-        provided_keys = set(data.keys())
-
-        entry_path = _save_uploaded_image(
-            request.files.get("entry_image"), ticket_type, "entry"
-        )
-        exit_path = _save_uploaded_image(
-            request.files.get("exit_image"), ticket_type, "exit"
-        )
-        crop_path = _save_uploaded_image(
-            request.files.get("crop_image"), ticket_type, "crop"
-        )
-
+        if request.is_json:
+            data = _read_json_body() or {}
+        else:
+            data = request.form.to_dict()
+        provided_keys = data.keys()
+        # Validate before saving any upload so a rejected request leaves no
+        # orphaned files behind.
         payload = _extract_ticket_data(data)
 
-        payload["entry_image_path"] = entry_path or (
-            payload.get("entry_image_path")
-            if "entry_image_path" in provided_keys
-            else getattr(ticket, "entry_image_path", None)
-        )
-        payload["exit_image_path"] = exit_path or (
-            payload.get("exit_image_path")
-            if "exit_image_path" in provided_keys
-            else getattr(ticket, "exit_image_path", None)
-        )
-        payload["crop_image_path"] = crop_path or (
-            payload.get("crop_image_path")
-            if "crop_image_path" in provided_keys
-            else getattr(ticket, "crop_image_path", None)
-        )
+        timestamp = f"{time.time_ns()}_{secrets.token_hex(2)}"
+        futures = {}
+        for category in IMAGE_CATEGORIES:
+            upload = request.files.get(f"{category}_image")
+            if upload and upload.filename:
+                futures[category] = _IO_POOL.submit(
+                    _save_uploaded_image, upload, ticket_type, category, timestamp
+                )
+        saved_paths = {category: future.result() for category, future in futures.items()}
+
+        for category in IMAGE_CATEGORIES:
+            key = f"{category}_image_path"
+            payload[key] = saved_paths.get(category) or (
+                payload.get(key)
+                if key in provided_keys
+                else getattr(ticket, key, None)
+            )
 
         for key, value in payload.items():
-            if value is None and key not in provided_keys:
-                value = getattr(ticket, key)
-            setattr(ticket, key, value)
+            if value is not None or key in provided_keys:
+                setattr(ticket, key, value)
 
         return ticket
 
+    def _ticket_page_query(model):
+        columns = model.__table__.c
+        limit = _to_int(request.args.get("limit")) or DEFAULT_PAGE_SIZE
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        stmt = sa.select(
+            *(column for column in columns if column.key not in LIST_EXCLUDED_FIELDS)
+        )
+
+        after_created_at = _parse_datetime(request.args.get("after_created_at"))
+        after_id = _to_int(request.args.get("after_id"))
+        if after_created_at is not None and after_id is not None:
+            stmt = stmt.where(
+                sa.tuple_(columns.created_at, columns.id)
+                < sa.tuple_(after_created_at, after_id)
+            )
+        stmt = stmt.order_by(columns.created_at.desc(), columns.id.desc())
+        # One extra row tells us whether another page exists.
+        return stmt.limit(limit + 1), limit
+
+    def _page_cursor(row) -> dict:
+        return {
+            "after_created_at": row["created_at"].isoformat()
+            if row["created_at"]
+            else None,
+            "after_id": row["id"],
+        }
+
+    def _fetch_ticket_page(model):
+        stmt, limit = _ticket_page_query(model)
+        rows = db.session.execute(stmt).mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _page_cursor(rows[-1])
+        return [dict(row) for row in rows], next_cursor
+
+    def _stream_ticket_page(model):
+        stmt, limit = _ticket_page_query(model)
+        engine = db.engine
+
+        def generate():
+            # The request's session is removed before the body is read, so the
+            # server-side cursor gets a connection of its own for the whole
+            # stream; the with block returns it even if the client disconnects.
+            with engine.connect() as connection:
+                result = connection.execution_options(
+                    yield_per=STREAM_BATCH_SIZE
+                ).execute(stmt)
+                yield b'{"tickets":['
+                last_row = None
+                has_more = False
+                for index, row in enumerate(result.mappings()):
+                    if index == limit:
+                        has_more = True
+                        break
+                    chunk = orjson.dumps(dict(row))
+                    yield chunk if index == 0 else b"," + chunk
+                    last_row = row
+                result.close()
+            next_cursor = _page_cursor(last_row) if has_more else None
+            yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+        return app.response_class(generate(), mimetype="application/json")
+
     @app.route("/<string:ticket_type>/tickets", methods=["GET"])
     def list_tickets(ticket_type: str) -> str:
-        model = _get_ticket_model(ticket_type)
-        tickets = model.query.order_by(model.created_at.desc()).all()
+        model, label = _resolve_ticket_type(ticket_type)
+        tickets, next_cursor = _fetch_ticket_page(model)
         return render_template(
             "tickets.html",
             tickets=tickets,
+            next_cursor=next_cursor,
             ticket_type=ticket_type,
-            ticket_label=_ticket_label(ticket_type),
+            ticket_label=label,
         )
 
     @app.route("/api/<string:ticket_type>/tickets", methods=["GET", "POST"])
     def api_list_tickets(ticket_type: str):
-        model = _get_ticket_model(ticket_type)
+        model, _ = _resolve_ticket_type(ticket_type)
 
         if request.method == "GET":
-            tickets = model.query.order_by(model.created_at.desc()).all()
-            return jsonify([ticket.as_dict() for ticket in tickets])
+            table = model.__table__
+            stmt = sa.select(
+                sa.func.max(table.c.updated_at), sa.func.count()
+            ).select_from(table)
+            last_updated, count = db.session.execute(stmt).one()
+            etag = _make_etag(last_updated, count, request.query_string)
+            if etag in request.if_none_match:
+                return _not_modified(etag)
+            response = _stream_ticket_page(model)
+            response.set_etag(etag)
+            return response
 
         ticket = model()
         _populate_ticket_from_request(ticket, ticket_type)
@@ -296,71 +553,148 @@ def create_app(test_config: Optional[dict] = None) -> Flask:
         db.session.commit()
         return jsonify(ticket.as_dict()), 201
 
+    @app.route("/api/<string:ticket_type>/tickets/bulk", methods=["POST"])
+    def api_bulk_create_tickets(ticket_type: str):
+        model, _ = _resolve_ticket_type(ticket_type)
+        payload = _read_json_body()
+        if not isinstance(payload, list) or not all(
+            isinstance(item, dict) for item in payload
+        ):
+            abort(400)
+
+        rows = [_extract_ticket_data(item) for item in payload]
+        if rows:
+            db.session.execute(sa.insert(model), rows)
+            db.session.commit()
+        return jsonify({"inserted": len(rows)}), 201
+
     @app.route("/<string:ticket_type>/tickets/new", methods=["GET", "POST"])
     def create_ticket(ticket_type: str) -> str:
-        model = _get_ticket_model(ticket_type)
+        model, label = _resolve_ticket_type(ticket_type)
         if request.method == "POST":
             ticket = model()
             _populate_ticket_from_request(ticket, ticket_type)
             db.session.add(ticket)
             db.session.commit()
-            flash(f"{_ticket_label(ticket_type)} ticket created", "success")
+            flash(f"{label} ticket created", "success")
             return redirect(url_for("list_tickets", ticket_type=ticket_type))
 
         return render_template(
             "ticket_form.html",
             ticket=None,
             ticket_type=ticket_type,
-            ticket_label=_ticket_label(ticket_type),
+            ticket_label=label,
         )
 
+    def _delete_ticket(model, ticket_id: int) -> None:
+        result = db.session.execute(sa.delete(model).where(model.id == ticket_id))
+        if result.rowcount == 0:
+            abort(404)
+        db.session.commit()
+
+    def _not_modified(etag: str):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
     @app.route("/<string:ticket_type>/tickets/<int:ticket_id>/edit", methods=["GET", "POST"])
     def edit_ticket(ticket_type: str, ticket_id: int) -> str:
-        model = _get_ticket_model(ticket_type)
-        ticket = model.query.get_or_404(ticket_id)
+        model, label = _resolve_ticket_type(ticket_type)
+        ticket = db.get_or_404(model, ticket_id)
         if request.method == "POST":
             _populate_ticket_from_request(ticket, ticket_type)
             db.session.commit()
-            flash(f"{_ticket_label(ticket_type)} ticket updated", "success")
+            flash(f"{label} ticket updated", "success")
             return redirect(url_for("list_tickets", ticket_type=ticket_type))
 
         return render_template(
             "ticket_form.html",
             ticket=ticket,
             ticket_type=ticket_type,
-            ticket_label=_ticket_label(ticket_type),
+            ticket_label=label,
         )
 
     @app.route("/<string:ticket_type>/tickets/<int:ticket_id>/delete", methods=["POST"])
     def delete_ticket(ticket_type: str, ticket_id: int):
-        model = _get_ticket_model(ticket_type)
-        ticket = model.query.get_or_404(ticket_id)
-        db.session.delete(ticket)
-        db.session.commit()
-        flash(f"{_ticket_label(ticket_type)} ticket deleted", "info")
+        model, label = _resolve_ticket_type(ticket_type)
+        _delete_ticket(model, ticket_id)
+        flash(f"{label} ticket deleted", "info")
         return redirect(url_for("list_tickets", ticket_type=ticket_type))
 
     @app.route("/api/<string:ticket_type>/tickets/<int:ticket_id>", methods=["GET", "PUT", "DELETE"])
     def api_ticket(ticket_type: str, ticket_id: int):
-        model = _get_ticket_model(ticket_type)
-        ticket = model.query.get_or_404(ticket_id)
-        if request.method == "GET":
-            return jsonify(ticket.as_dict())
+        model, _ = _resolve_ticket_type(ticket_type)
         if request.method == "DELETE":
-            db.session.delete(ticket)
-            db.session.commit()
+            _delete_ticket(model, ticket_id)
             return ("", 204)
 
+        if request.method == "GET":
+            stmt = sa.select(model.updated_at).where(model.id == ticket_id)
+            last_updated = db.session.execute(stmt).scalar()
+            if last_updated is None:
+                abort(404)
+            etag = _make_etag(ticket_id, last_updated)
+            if etag in request.if_none_match:
+                return _not_modified(etag)
+            response = jsonify(db.get_or_404(model, ticket_id).as_dict())
+            response.set_etag(etag)
+            return response
+
+        ticket = db.get_or_404(model, ticket_id)
         _populate_ticket_from_request(ticket, ticket_type)
         db.session.commit()
         return jsonify(ticket.as_dict())
 
+    @app.route("/api/<string:ticket_type>/tickets/<int:ticket_id>/image", methods=["GET"])
+    def api_ticket_image(ticket_type: str, ticket_id: int):
+        model, _ = _resolve_ticket_type(ticket_type)
+        stmt = sa.select(model.image_base64).where(model.id == ticket_id)
+        row = db.session.execute(stmt).one_or_none()
+        if row is None:
+            abort(404)
+        return jsonify({"id": ticket_id, "image_base64": row.image_base64})
+
     return app
 
 
+def _make_etag(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _read_json_body():
+    # Equivalent to request.get_json(silent=True) without the provider and
+    # caching layers in between.
+    if not request.is_json:
+        return None
+    try:
+        return orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _extract_ticket_data(payload: dict) -> dict:
+    data = {key: _to_int(payload.get(key)) for key in INT_FIELDS}
+    for key, (low, high) in INT_FIELD_RANGES.items():
+        value = data[key]
+        if value is not None and not low <= value <= high:
+            abort(400, description=f"{key} must be between {low} and {high}")
+    for key in DATETIME_FIELDS:
+        value = payload.get(key)
+        data[key] = _parse_datetime_cached(value) if value else None
+    data.update({key: payload.get(key) for key in STRING_FIELDS})
+    return data
+
+
 def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
+    return _parse_datetime_cached(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_datetime_cached(value: str) -> Optional[datetime]:
+    # Malformed values are cached as None too, so resubmitting them skips the
+    # exception path.
     try:
         return datetime.fromisoformat(value)
     except ValueError:
@@ -368,8 +702,12 @@ def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
 
 
 def _to_int(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
     try:
-        return int(value) if value else None
+        return int(value)
     except ValueError:
         return None
 
@@ -1,5 +1,20 @@
+"""Generate the MySQL schema dump for the Parkonic ticket tables.
+
+The dump is written without fsync by default: the call returns once the data
+is in the page cache, which is much faster on journaled or rotational
+filesystems. Pass ``--durable`` (or ``main(durable=True)``) when another host
+will read the file straight away and it must be on disk first.
+"""
+
+import argparse
 import datetime
+import gzip
+import mmap
+import os
+import sys
+import time
 from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple
 
 # Output SQL dump file name
 DUMP_FILENAME = "Dump_parkonic_tickets.sql"
@@ -7,13 +22,20 @@ DUMP_FILENAME = "Dump_parkonic_tickets.sql"
 # Database name
 DATABASE_NAME = "parkonic_tickets"
 
+# Dumps at least this large are written through mmap instead of write()
+MMAP_THRESHOLD = 64 * 1024
+
+# Clock lookups bound once for generate_sql_dump()
+_time = time.time
+_utcfromtimestamp = datetime.datetime.utcfromtimestamp
 
-def generate_sql_dump() -> str:
-    """Generate a MySQL dump-style SQL script for omc_ticket and ocr_ticket tables."""
-    now = datetime.datetime.utcnow()
-    timestamp_str = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    dump = f"""-- MySQL dump 10.13  Distrib 8.0.xx, for Win64 (x86_64)
+# Tables emitted by the dump; they all share the same structure.
+TABLE_NAMES = ("omc_ticket", "ocr_ticket")
+
+# Everything except the completion timestamp is fixed, so the script is built
+# and encoded once at import time.
+_SQL_PREAMBLE = f"""-- MySQL dump 10.13  Distrib 8.0.xx, for Win64 (x86_64)
 --
 -- Host: localhost    Database: {DATABASE_NAME}
 -- ------------------------------------------------------
@@ -40,83 +62,56 @@ CREATE DATABASE IF NOT EXISTS `{DATABASE_NAME}`
 
 USE `{DATABASE_NAME}`;
 
---
--- Table structure for table `omc_ticket`
---
-
-DROP TABLE IF EXISTS `omc_ticket`;
-
 /*!40101 SET @saved_cs_client     = @@character_set_client */;
 /*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `omc_ticket` (
-  `id` int unsigned NOT NULL AUTO_INCREMENT,
-  `camera_id` int DEFAULT NULL,
-  `zone_name` varchar(50) DEFAULT NULL,
-  `camera_ip` varchar(45) DEFAULT NULL,
-  `zone_region` varchar(50) DEFAULT NULL,
-  `spot_number` int DEFAULT NULL,
-  `plate_number` varchar(20) DEFAULT NULL,
-  `plate_code` varchar(10) DEFAULT NULL,
-  `plate_city` varchar(50) DEFAULT NULL,
-  `confidence` int DEFAULT NULL,
-  `entry_time` datetime DEFAULT NULL,
-  `exit_time` datetime DEFAULT NULL,
-  `status` varchar(20) DEFAULT NULL,
-  `parkonic_trip_id` int DEFAULT NULL,
-  `image_base64` longtext,
-  `crop_image_path` varchar(255) DEFAULT NULL,
-  `entry_image_path` varchar(255) DEFAULT NULL,
-  `exit_image_path` varchar(255) DEFAULT NULL,
-  `exit_clip_path` varchar(255) DEFAULT NULL,
-  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  `process_time_in` datetime DEFAULT NULL,
-  `process_time_out` datetime DEFAULT NULL,
-  PRIMARY KEY (`id`),
-  KEY `idx_camera_time` (`camera_id`,`entry_time`),
-  KEY `idx_plate` (`plate_number`,`plate_code`),
-  KEY `idx_trip` (`parkonic_trip_id`),
-  KEY `idx_zone` (`zone_name`,`zone_region`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
 
---
--- Table structure for table `ocr_ticket`
+""".encode("utf-8")
+
+# ``{t}`` is replaced with each name in TABLE_NAMES.
+_TABLE_DDL_TEMPLATE = b"""--
+-- Table structure for table `{t}`
 --
 
-DROP TABLE IF EXISTS `ocr_ticket`;
+DROP TABLE IF EXISTS `{t}`;
 
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `ocr_ticket` (
+CREATE TABLE `{t}` (
   `id` int unsigned NOT NULL AUTO_INCREMENT,
-  `camera_id` int DEFAULT NULL,
+  `camera_id` smallint DEFAULT NULL,
   `zone_name` varchar(50) DEFAULT NULL,
-  `camera_ip` varchar(45) DEFAULT NULL,
+  `camera_ip` varchar(45) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `zone_region` varchar(50) DEFAULT NULL,
-  `spot_number` int DEFAULT NULL,
+  `spot_number` smallint DEFAULT NULL,
   `plate_number` varchar(20) DEFAULT NULL,
-  `plate_code` varchar(10) DEFAULT NULL,
+  `plate_code` varchar(10) CHARACTER SET ascii COLLATE ascii_general_ci DEFAULT NULL,
   `plate_city` varchar(50) DEFAULT NULL,
-  `confidence` int DEFAULT NULL,
+  `confidence` smallint DEFAULT NULL,
   `entry_time` datetime DEFAULT NULL,
   `exit_time` datetime DEFAULT NULL,
   `status` varchar(20) DEFAULT NULL,
   `parkonic_trip_id` int DEFAULT NULL,
-  `image_base64` longtext,
+  `image_base64` mediumtext CHARACTER SET ascii COLLATE ascii_bin,
   `crop_image_path` varchar(255) DEFAULT NULL,
   `entry_image_path` varchar(255) DEFAULT NULL,
   `exit_image_path` varchar(255) DEFAULT NULL,
   `exit_clip_path` varchar(255) DEFAULT NULL,
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` datetime(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   `process_time_in` datetime DEFAULT NULL,
   `process_time_out` datetime DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `idx_camera_time` (`camera_id`,`entry_time`),
+  KEY `idx_created_at` (`created_at`),
   KEY `idx_plate` (`plate_number`,`plate_code`),
+  KEY `idx_status_exit` (`status`,`exit_time`),
   KEY `idx_trip` (`parkonic_trip_id`),
-  KEY `idx_zone` (`zone_name`,`zone_region`)
+  KEY `idx_updated_at` (`updated_at`),
+  KEY `idx_zone` (`zone_name`,`zone_region`),
+  CONSTRAINT `ck_{t}_confidence` CHECK (`confidence` between 0 and 100)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
+
+"""
+
+_SQL_POSTAMBLE = b"""/*!40101 SET character_set_client = @saved_cs_client */;
 
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
@@ -128,16 +123,155 @@ CREATE TABLE `ocr_ticket` (
 /*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
 /*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
 
--- Dump completed on {timestamp_str}
 """
-    return dump
 
+# Inline base64 images inflate rows and push them off-page in InnoDB. Image
+# files belong on disk or object storage, referenced from crop_image_path,
+# entry_image_path and exit_image_path; this column is only kept because the
+# application still reads it.
+_IMAGE_BLOB_COLUMN = (
+    b"  `image_base64` mediumtext CHARACTER SET ascii COLLATE ascii_bin,\n"
+)
+
+
+def _build_table_ddls(include_blob_column: bool) -> Tuple[bytes, ...]:
+    table_ddl = _TABLE_DDL_TEMPLATE
+    if not include_blob_column:
+        table_ddl = table_ddl.replace(_IMAGE_BLOB_COLUMN, b"")
+    return tuple(table_ddl.replace(b"{t}", name.encode("ascii")) for name in TABLE_NAMES)
+
+
+_TABLE_DDLS = {
+    include_blob_column: _build_table_ddls(include_blob_column)
+    for include_blob_column in (True, False)
+}
+
+_SQL_COMPLETED_PREFIXES = {
+    include_blob_column: b"".join(
+        (_SQL_PREAMBLE, *table_ddls, _SQL_POSTAMBLE, b"-- Dump completed on ")
+    )
+    for include_blob_column, table_ddls in _TABLE_DDLS.items()
+}
+
+
+def _completed_timestamp(second: int) -> bytes:
+    return (
+        _utcfromtimestamp(second).isoformat(sep=" ", timespec="seconds").encode("ascii")
+    )
+
+
+# The dump only changes when its one-second-resolution timestamp does, so the
+# last result is reused for calls within the same second.
+_last_dump_key = None
+_last_dump = b""
+
+
+def generate_sql_dump(include_blob_column: bool = True) -> bytes:
+    """Generate a MySQL dump-style SQL script for omc_ticket and ocr_ticket tables.
+
+    ``include_blob_column=False`` leaves out the legacy ``image_base64`` column.
+    """
+    global _last_dump_key, _last_dump
+
+    second = int(_time())
+    key = (second, include_blob_column)
+    if key != _last_dump_key:
+        _last_dump = b"".join(
+            (
+                _SQL_COMPLETED_PREFIXES[include_blob_column],
+                _completed_timestamp(second),
+                b"\n",
+            )
+        )
+        _last_dump_key = key
+    return _last_dump
+
+
+def iter_sql_dump_chunks(include_blob_column: bool = True) -> Iterator[bytes]:
+    """Yield the same script as generate_sql_dump() piece by piece.
+
+    Lets callers pipe the dump (e.g. into ``mysql``) without building it first.
+    """
+    yield _SQL_PREAMBLE
+    yield from _TABLE_DDLS[include_blob_column]
+    yield _SQL_POSTAMBLE
+    yield b"-- Dump completed on " + _completed_timestamp(int(_time())) + b"\n"
+
+
+def _write_file(path: Path, data: bytes, durable: bool = False) -> None:
+    """Write ``data`` to ``path`` straight from the buffer.
+
+    Payloads of at least MMAP_THRESHOLD bytes are copied into a mapping of the
+    pre-sized file; smaller ones take one write() syscall per chunk. The file
+    is only fsync'ed when ``durable`` is set.
+    """
+    # O_BINARY keeps Windows from translating LF bytes (gzip payloads included).
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, len(data), os.POSIX_FADV_SEQUENTIAL)
+        if len(data) >= MMAP_THRESHOLD:
+            os.ftruncate(fd, len(data))
+            with mmap.mmap(fd, len(data)) as mapped:
+                mapped[:] = data
+                if durable:
+                    mapped.flush()
+        else:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def main(argv: Optional[Sequence[str]] = None, durable: bool = False):
+    parser = argparse.ArgumentParser(description=__doc__.partition("\n")[0])
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help=f"write a gzip-compressed {DUMP_FILENAME}.gz instead of plain SQL",
+    )
+    parser.add_argument(
+        "--without-image-blob",
+        action="store_true",
+        help="omit the legacy image_base64 column from both tables",
+    )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="stream the dump to standard output instead of writing a file",
+    )
+    parser.add_argument(
+        "--durable",
+        action="store_true",
+        help="fsync the dump before exiting",
+    )
+    args = parser.parse_args(argv)
+    include_blob_column = not args.without_image_blob
+
+    if args.stdout:
+        out = sys.stdout.buffer
+        if args.compress:
+            out = gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6)
+        for chunk in iter_sql_dump_chunks(include_blob_column=include_blob_column):
+            out.write(chunk)
+        if args.compress:
+            out.close()
+        sys.stdout.buffer.flush()
+        return
 
-def main():
-    dump_sql = generate_sql_dump()
+    dump_sql = generate_sql_dump(include_blob_column=include_blob_column)
 
-    output_path = Path(DUMP_FILENAME).resolve()
-    output_path.write_text(dump_sql, encoding="utf-8")
+    if args.compress:
+        output_path = Path(f"{DUMP_FILENAME}.gz").absolute()
+        dump_sql = gzip.compress(dump_sql, compresslevel=6)
+    else:
+        output_path = Path(DUMP_FILENAME).absolute()
+    _write_file(output_path, dump_sql, durable=durable or args.durable)
 
     print(f"[OK] SQL dump file generated: {output_path}")
 